@@ -1,26 +1,33 @@
 import os
 import uuid
+import bisect
 import shutil
 import argparse
-import platform
 import json
-from typing import Dict, Any, Optional
+import functools
+import subprocess
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, Any, List, Optional, Tuple
 
-from moviepy.editor import VideoFileClip, ImageClip, CompositeVideoClip, TextClip
-from moviepy.video.fx.resize import resize
-from moviepy.config import change_settings
+from moviepy.video.io.ffmpeg_reader import ffmpeg_parse_infos
+from moviepy.config import get_setting
+from PIL import Image, ImageDraw, ImageFont
 
-# Configure ImageMagick path for Windows (same as original)
-if platform.system() == "Windows":
-    change_settings(
-        {
-            "IMAGEMAGICK_BINARY": r"C:\Program Files\ImageMagick-7.1.2-Q16-HDRI\magick.exe"
-        }
-    )
+# FFmpeg binary resolved by MoviePy (imageio-ffmpeg bundle unless overridden)
+FFMPEG_BINARY = get_setting("FFMPEG_BINARY")
+# ffprobe is optional (imageio-ffmpeg does not bundle it); look next to FFmpeg, then PATH
+FFPROBE_BINARY = shutil.which(
+    "ffprobe", path=os.path.dirname(FFMPEG_BINARY) or None
+) or shutil.which("ffprobe")
 
 # Video configuration (same as original)
 VIDEO_WIDTH = 1080
 VIDEO_HEIGHT = 1920
+# Output frame rate cap; lower-rate sources keep their own rate
+MAX_FPS = 30
+
+# Hardware H.264 encoders tried by encoder="auto", in order of preference
+HARDWARE_ENCODERS = ["h264_nvenc", "h264_qsv", "h264_amf", "h264_videotoolbox"]
 
 # Config file in same folder as this script
 CONFIG_FILE = os.path.join(os.path.dirname(__file__), "config.json")
@@ -43,15 +50,38 @@ DEFAULT_CONFIG: Dict[str, Any] = {
     "start": 0,
     "end": None,
     "initial_part": 0,
+    "overlays": True,
+    "preset": "faster",
+    "crf": 23,
+    "encoder": "auto",
+    "workers": None,  # parallel part encodes; None = based on CPU count
+    "threads": 2,  # encoder threads per part
+    "single_encode": None,  # None = auto: single encode when parts would run one at a time
+    # Advanced FFmpeg output options; set to null to leave FFmpeg's default
+    "movflags": "+faststart",  # moov atom first, so uploads need no remux
+    "tune": "zerolatency",  # libx264 only: no B-frames/lookahead, faster encode
+    "pix_fmt": "yuv420p",  # widest player compatibility
 }
 
 
 # ---------------------- Config utilities ---------------------- #
+def write_config(config_path: str, config: Dict[str, Any]) -> None:
+    """
+    Write config.json atomically (temp file + os.replace), so a concurrent reader
+    never sees a partially written file.
+    """
+    tmp_path = f"{config_path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(config, f, indent=4)
+    os.replace(tmp_path, config_path)
+
+
 def ensure_config_file(config_path: str = CONFIG_FILE) -> Dict[str, Any]:
     """
     Ensure config.json exists at config_path.
     - If missing: create it with DEFAULT_CONFIG.
-    - If exists: load it, add missing keys from DEFAULT_CONFIG, and write back the updated file.
+    - If exists: load it, add missing keys from DEFAULT_CONFIG, and write it back
+      only if something was actually added.
     Returns the loaded (and possibly updated) config dict.
     """
     defaults = DEFAULT_CONFIG.copy()
@@ -61,35 +91,427 @@ def ensure_config_file(config_path: str = CONFIG_FILE) -> Dict[str, Any]:
         try:
             with open(config_path, "r", encoding="utf-8") as f:
                 config = json.load(f) or {}
-            # Fill missing keys with defaults (preserve user keys)
-            updated = False
-            for k, v in defaults.items():
-                if k not in config:
-                    config[k] = v
-                    updated = True
-            if updated:
-                with open(config_path, "w", encoding="utf-8") as f:
-                    json.dump(config, f, indent=4)
-                print(f"Updated config.json with missing defaults at: {config_path}")
+            if not isinstance(config, dict):
+                raise ValueError("top-level JSON value is not an object")
         except Exception as e:
             # Invalid JSON or read error -> regenerate with defaults
             print(
                 f"Invalid config.json ({e}). Recreating with defaults at: {config_path}"
             )
             config = defaults.copy()
-            with open(config_path, "w", encoding="utf-8") as f:
-                json.dump(config, f, indent=4)
+            write_config(config_path, config)
             print(f"Created default config.json at {config_path}")
+            return config
+
+        # Fill missing keys with defaults (preserve user keys)
+        original = dict(config)
+        for k, v in defaults.items():
+            config.setdefault(k, v)
+        if config != original:
+            write_config(config_path, config)
+            print(f"Updated config.json with missing defaults at: {config_path}")
     else:
         # Create config with defaults
         config = defaults.copy()
-        with open(config_path, "w", encoding="utf-8") as f:
-            json.dump(config, f, indent=4)
+        write_config(config_path, config)
         print(f"Created default config.json at {config_path}")
 
     return config
 
 
+# ---------------------- FFmpeg helpers ---------------------- #
+def escape_filter_value(value: str) -> str:
+    """
+    Escape a filter option value for use inside -filter_complex.
+    Two levels apply: the filter option parser first, then the filtergraph parser.
+    """
+    for ch in ("\\", "'", ":"):
+        value = value.replace(ch, "\\" + ch)
+    for ch in ("\\", "'", "[", "]", ",", ";"):
+        value = value.replace(ch, "\\" + ch)
+    return value
+
+
+def drawtext_filter(
+    text: str,
+    font: str,
+    fontsize: int,
+    color: str,
+    x: str,
+    y: str,
+    expansion: str = "none",
+) -> str:
+    """
+    Build a drawtext filter using the given font file. Text is literal unless
+    expansion="normal", which evaluates %{...} sequences per frame.
+    """
+    if not os.path.isfile(font):
+        raise FileNotFoundError(f"Font file not found: {font}")
+    return (
+        f"drawtext=fontfile={escape_filter_value(font)}"
+        f":text={escape_filter_value(text)}:expansion={expansion}"
+        f":fontsize={fontsize}:fontcolor={escape_filter_value(color)}"
+        f":x={x}:y={y}"
+    )
+
+
+def run_ffmpeg(args: List[str], progress: bool = True) -> None:
+    """
+    Run FFmpeg with the given arguments, raising CalledProcessError on failure.
+    progress=False hides the live stats line (used when several encodes run at once).
+    -nostdin keeps FFmpeg off the terminal, so parallel encodes cannot change its
+    mode or be stopped by a stray keypress.
+    """
+    cmd = [FFMPEG_BINARY, "-hide_banner", "-nostdin", "-y", "-loglevel", "error"]
+    cmd.append("-stats" if progress else "-nostats")
+    subprocess.run(cmd + args, check=True)
+
+
+def probe_keyframes(input_video: str, start: float, end: float) -> List[float]:
+    """
+    Return the sorted video keyframe timestamps (seconds from the start of the file)
+    between start and end. Only that range is read, and only packets (no decoding);
+    ffprobe's output is streamed line by line since long ranges produce hundreds of
+    thousands of packet lines.
+    Returns an empty list if ffprobe is unavailable.
+    """
+    if not FFPROBE_BINARY:
+        return []
+
+    cmd = [
+        FFPROBE_BINARY,
+        "-v",
+        "error",
+        "-select_streams",
+        "v:0",
+        "-show_entries",
+        "packet=pts_time,flags:format=start_time",
+        "-read_intervals",
+        f"{max(0, start)}%{end}",
+        "-of",
+        "compact",
+        input_video,
+    ]
+
+    keyframes: List[float] = []
+    start_time = 0.0
+    with subprocess.Popen(cmd, stdout=subprocess.PIPE, text=True) as proc:
+        for line in proc.stdout:
+            section, *fields = line.rstrip("\n").split("|")
+            values = dict(field.split("=", 1) for field in fields if "=" in field)
+            if section == "format" and values.get("start_time", "N/A") != "N/A":
+                start_time = float(values["start_time"])
+            elif "K" in values.get("flags", "") and values.get("pts_time", "N/A") != "N/A":
+                keyframes.append(float(values["pts_time"]))
+    if proc.returncode:
+        raise subprocess.CalledProcessError(proc.returncode, cmd)
+
+    # FFmpeg's -ss is relative to the container start time, so normalise to it
+    return sorted(t - start_time for t in keyframes)
+
+
+def probe_audio_codec(input_video: str) -> Optional[str]:
+    """Return the codec name of the first audio stream, or None if unknown/absent."""
+    if not FFPROBE_BINARY:
+        return None
+
+    result = subprocess.run(
+        [FFPROBE_BINARY, "-v", "error", "-select_streams", "a:0"]
+        + ["-show_entries", "stream=codec_name", "-of", "default=nw=1:nk=1"]
+        + [input_video],
+        capture_output=True,
+        text=True,
+    )
+    return result.stdout.strip() or None
+
+
+def audio_encoder_args(audio_codec: Optional[str]) -> List[str]:
+    """
+    AAC sources are copied into the MP4 as-is; anything else is encoded to AAC.
+    Only the first audio track is mapped (0:a:0?), matching what is probed here.
+    """
+    if audio_codec == "aac":
+        return ["-c:a", "copy"]
+    return ["-c:a", "aac", "-b:a", "128k"]
+
+
+def snap_to_keyframe(t: float, keyframes: List[float]) -> float:
+    """Return the nearest keyframe at or before t (t itself if none is known)."""
+    index = bisect.bisect_right(keyframes, t) - 1
+    return keyframes[index] if index >= 0 else t
+
+
+@functools.lru_cache(maxsize=None)
+def encoder_works(encoder: str) -> bool:
+    """
+    Check that an encoder can actually open by encoding a single tiny frame.
+    FFmpeg builds list hardware encoders even when no matching GPU/driver is present.
+    """
+    result = subprocess.run(
+        [FFMPEG_BINARY, "-hide_banner", "-loglevel", "error"]
+        + ["-f", "lavfi", "-i", "color=size=256x256:duration=0.1"]
+        + ["-frames:v", "1", "-c:v", encoder, "-f", "null", "-"],
+        stdin=subprocess.DEVNULL,
+        capture_output=True,
+    )
+    return result.returncode == 0
+
+
+@functools.lru_cache(maxsize=None)
+def resolve_encoder(encoder: str = "auto") -> str:
+    """
+    Resolve "auto" to the first working hardware encoder, falling back to libx264.
+    Any other value is returned unchanged.
+    """
+    if encoder != "auto":
+        return encoder
+
+    listed = subprocess.run(
+        [FFMPEG_BINARY, "-hide_banner", "-encoders"],
+        stdin=subprocess.DEVNULL,
+        capture_output=True,
+        text=True,
+    ).stdout
+    for candidate in HARDWARE_ENCODERS:
+        if f" {candidate} " in listed and encoder_works(candidate):
+            return candidate
+    return "libx264"
+
+
+def video_encoder_args(
+    encoder: str, preset: str, crf: int, tune: Optional[str] = None
+) -> List[str]:
+    """
+    Map the x264-style preset/crf settings onto the options of the chosen encoder.
+    tune is an x264 tune and only applies to libx264 (NVENC uses its own).
+    "cuda" is the full-GPU pipeline and encodes with NVENC.
+    """
+    if encoder in ("h264_nvenc", "cuda"):
+        return [
+            *("-c:v", "h264_nvenc", "-preset", "p4", "-tune", "hq"),
+            *("-rc-lookahead", "0"),
+            *("-rc", "vbr", "-cq", str(crf), "-b:v", "0"),
+        ]
+    if encoder == "h264_qsv":
+        return [
+            *("-c:v", encoder, "-preset", "faster", "-async_depth", "4"),
+            *("-global_quality", str(crf)),
+        ]
+    if encoder == "h264_amf":
+        return [
+            *("-c:v", encoder, "-usage", "transcoding", "-quality", "balanced"),
+            *("-rc", "cqp", "-qp_i", str(crf), "-qp_p", str(crf)),
+        ]
+    if encoder == "h264_videotoolbox":
+        # VideoToolbox has no CRF equivalent on all Macs; use a Reels-friendly bitrate
+        return ["-c:v", encoder, "-b:v", "6M"]
+    if encoder == "libx264":
+        args = ["-c:v", encoder, "-preset", preset, "-crf", str(crf)]
+        return args + ["-tune", tune] if tune else args
+    return ["-c:v", encoder]
+
+
+# Encoder option that turns forced keyframes into IDR frames. Without it these
+# encoders emit plain I-frames, which the segment muxer does not cut on.
+FORCED_IDR_OPTIONS = {
+    "h264_nvenc": "forced-idr",
+    "cuda": "forced-idr",
+    "h264_qsv": "forced_idr",
+    "h264_amf": "forced_idr",
+}
+
+
+@functools.lru_cache(maxsize=None)
+def encoder_has_option(encoder: str, option: str) -> bool:
+    """Check whether this FFmpeg build's encoder lists the given private option."""
+    help_text = subprocess.run(
+        [FFMPEG_BINARY, "-hide_banner", "-h", f"encoder={encoder}"],
+        stdin=subprocess.DEVNULL,
+        capture_output=True,
+        text=True,
+    ).stdout
+    return f"-{option} " in help_text
+
+
+def forced_idr_args(encoder: str) -> List[str]:
+    """
+    Args making -force_key_frames produce IDR frames. libx264 already does; older
+    builds of the other encoders without the option are left unchanged.
+    """
+    option = FORCED_IDR_OPTIONS.get(encoder)
+    codec = "h264_nvenc" if encoder == "cuda" else encoder
+    if option and encoder_has_option(codec, option):
+        return [f"-{option}", "1"]
+    return []
+
+
+def default_workers(num_parts: int, threads: int, encoder: str) -> int:
+    """
+    Number of parts to encode concurrently: enough encoders to fill the CPU,
+    each using `threads` threads. Hardware encoders are capped at 2 sessions
+    since consumer GPUs limit concurrent encodes.
+    """
+    workers = max(1, (os.cpu_count() or 1) // max(1, threads))
+    if encoder in HARDWARE_ENCODERS or encoder == "cuda":
+        workers = min(workers, 2)
+    return max(1, min(num_parts, workers))
+
+
+def render_part(args: List[str], output_path: str, progress: bool) -> str:
+    """Render (or copy) a single part with FFmpeg. Runs inside a worker thread."""
+    run_ffmpeg(args, progress=progress)
+    return output_path
+
+
+@functools.lru_cache(maxsize=16)
+def load_font(font: str, fontsize: int) -> ImageFont.FreeTypeFont:
+    """Open a TrueType font once per (font, size) and reuse it for later text."""
+    if not os.path.isfile(font):
+        raise FileNotFoundError(f"Font file not found: {font}")
+    return ImageFont.truetype(font, fontsize)
+
+
+def render_static_overlays(
+    output_dir: str,
+    logo_image: Optional[str],
+    username: str,
+    video_title: str,
+    username_font: str,
+    title_font: str,
+    username_color: str,
+    title_color: str,
+) -> List[Tuple[str, int, int]]:
+    """
+    Pre-render the logo + username and the title as transparent PNG layers, each
+    cropped to its visible pixels. FFmpeg's overlay blends every pixel of its
+    input on every frame, so small tiles instead of one full-frame layer keep the
+    per-frame blending to the few pixels that are actually covered.
+    logo_image must be None when there is no logo file.
+    Returns (path, x, y) for each layer.
+    """
+    layers: List[Tuple[str, int, int]] = []
+
+    def new_canvas():
+        return Image.new("RGBA", (VIDEO_WIDTH, VIDEO_HEIGHT), (0, 0, 0, 0))
+
+    def draw_text(canvas, text, font_path, fontsize, color, position):
+        # position is a callable (text_w, text_h) -> top-left of the text box
+        draw = ImageDraw.Draw(canvas)
+        font = load_font(font_path, fontsize)
+        left, top, right, bottom = draw.textbbox((0, 0), text, font=font)
+        x, y = position(right - left, bottom - top)
+        draw.text((x - left, y - top), text, font=font, fill=color)
+
+    def save_layer(canvas, name):
+        bbox = canvas.getbbox()
+        if bbox:
+            path = os.path.join(output_dir, f"{name}.png")
+            canvas.crop(bbox).save(path)
+            layers.append((path, bbox[0], bbox[1]))
+
+    # --- Logo + username ---
+    branding = new_canvas()
+    logo_x, logo_y = 50, VIDEO_HEIGHT - 80
+    if logo_image:
+        with Image.open(logo_image) as logo:
+            logo_w = round(logo.width * 50 / logo.height)
+            logo = logo.convert("RGBA").resize((logo_w, 50), Image.LANCZOS)
+        branding.alpha_composite(logo, (logo_x, logo_y))
+        draw_text(
+            branding,
+            f"/{username[1:]}",
+            username_font,
+            30,
+            username_color,
+            lambda w, h: (logo_x + logo_w + 10, logo_y + (50 - h) // 2),
+        )
+    else:
+        draw_text(
+            branding,
+            username,
+            username_font,
+            30,
+            username_color,
+            lambda w, h: (VIDEO_WIDTH - w - 50, VIDEO_HEIGHT - h - 50),
+        )
+    save_layer(branding, "branding")
+
+    # --- Title ---
+    title = new_canvas()
+    draw_text(
+        title,
+        video_title,
+        title_font,
+        70,
+        title_color,
+        lambda w, h: ((VIDEO_WIDTH - w) // 2, 200),
+    )
+    save_layer(title, "title")
+
+    return layers
+
+
+def copy_parts(
+    input_video: str,
+    start: int,
+    end: float,
+    part_duration: int,
+    initial_part: int,
+    output_folder: str,
+    movflags: Optional[str] = None,
+) -> List[str]:
+    """
+    Split without re-encoding. A single FFmpeg process demuxes the range once and
+    the segment muxer writes every part by packet copy. Copied parts must start on
+    a keyframe, so cut points are snapped back to the nearest prior keyframe.
+    Returns the written part paths.
+    """
+    # The keyframe before start may lie up to a part earlier. -read_intervals uses
+    # raw timestamps rather than ones relative to the container start, so the end
+    # is padded by a part as well.
+    keyframes = probe_keyframes(
+        input_video, start - part_duration, end + part_duration
+    )
+    if not keyframes:
+        print(
+            "No keyframe index (ffprobe not found); parts will start at the first "
+            "keyframe after each boundary"
+        )
+    cut_start = snap_to_keyframe(start, keyframes)
+
+    # Cut points relative to cut_start; parts left without a keyframe are merged
+    cut_points: List[float] = []
+    for t in range(start + part_duration, int(end), part_duration):
+        point = snap_to_keyframe(t, keyframes) - cut_start
+        if point > (cut_points[-1] if cut_points else 0):
+            cut_points.append(point)
+
+    # "%" is the segment number placeholder, so escape it in the folder name
+    pattern = os.path.join(output_folder.replace("%", "%%"), "part_%d.mp4")
+    args = (
+        ["-ss", str(cut_start), "-t", str(end - cut_start), "-i", input_video]
+        + ["-map", "0:v:0", "-map", "0:a:0?", "-c", "copy"]
+        + ["-f", "segment", "-reset_timestamps", "1"]
+        + ["-segment_start_number", str(initial_part)]
+    )
+    if movflags:
+        args += ["-segment_format_options", f"movflags={movflags}"]
+    if cut_points:
+        # The muxer cuts at the first keyframe at or after each time; back off 1 ms
+        # so float rounding cannot push a cut past its keyframe
+        times = ",".join(f"{point - 0.001:.3f}" for point in cut_points)
+        args += ["-segment_times", times]
+    else:
+        args += ["-segment_time", str(end)]
+    run_ffmpeg(args + [pattern])
+
+    part_paths = [
+        os.path.join(output_folder, f"part_{initial_part + n}.mp4")
+        for n in range(len(cut_points) + 1)
+    ]
+    return [path for path in part_paths if os.path.exists(path)]
+
+
 # ---------------------- Video generation logic (unchanged features) ---------------------- #
 def generate_reels_parts(
     input_video: str,
@@ -101,16 +523,37 @@ def generate_reels_parts(
     username: str = "@username",
     video_title: str = "Video Title",
     part_duration: int = 30,
-    username_font: str = "Arial-Bold",
-    title_font: str = "Arial-Bold",
-    part_font: str = "Arial-Bold",
+    username_font: str = "fonts/Montserrat-Italic.ttf",
+    title_font: str = "fonts/Philosopher-Bold.ttf",
+    part_font: str = "fonts/MarckScript-Regular.ttf",
     username_color: str = "white",
     title_color: str = "yellow",
     part_color: str = "white",
     output_base: str = "output",
+    overlays: bool = True,
+    preset: str = "faster",
+    crf: int = 23,
+    encoder: str = "auto",
+    workers: Optional[int] = None,
+    threads: int = 2,
+    single_encode: Optional[bool] = None,
+    movflags: Optional[str] = "+faststart",
+    tune: Optional[str] = "zerolatency",
+    pix_fmt: Optional[str] = "yuv420p",
 ):
-    clip = VideoFileClip(input_video)
-    duration = clip.duration
+    # Only metadata is needed; all decoding and compositing happens inside FFmpeg,
+    # so probe it without opening MoviePy's frame/audio reader processes
+    infos = ffmpeg_parse_infos(input_video)
+    if not infos.get("video_found"):
+        raise ValueError(f"No video stream found in {input_video}.")
+    duration = infos["duration"]
+    width, height = infos["video_size"]
+    if infos.get("video_rotation", 0) in (90, 270):
+        # FFmpeg auto-rotates while filtering, so use the displayed orientation
+        width, height = height, width
+    aspect_ratio = width / height
+    # Encoding above the source rate only duplicates frames
+    fps = max(1, min(MAX_FPS, int(round(infos.get("video_fps") or MAX_FPS))))
 
     # Validate start/end
     start = max(0, start)
@@ -122,104 +565,279 @@ def generate_reels_parts(
     output_folder = os.path.join(output_base, f"{video_title}_{project_id}")
     os.makedirs(output_folder, exist_ok=True)
 
+    if not overlays:
+        # --- Stream copy (no decode/encode) ---
+        for output_path in copy_parts(
+            input_video,
+            start,
+            end,
+            part_duration,
+            initial_part,
+            output_folder,
+            movflags=movflags,
+        ):
+            print(f"Saved {output_path}")
+        print(f"All parts saved in {output_folder}")
+        return
+
     temp_dir = os.path.join("temp", f"video_split_{project_id}")
     os.makedirs(temp_dir, exist_ok=True)
 
+    encoder = resolve_encoder(encoder)
+    print(f"Using video encoder: {encoder}")
+    if not FFPROBE_BINARY:
+        print("ffprobe not found on PATH; audio will be re-encoded to AAC")
+    audio_args = audio_encoder_args(probe_audio_codec(input_video))
+    video_args = video_encoder_args(encoder, preset, crf, tune)
+
+    # Asset files cannot change during a run, so check them once up front
+    has_background = bool(background_image) and os.path.exists(background_image)
+    has_logo = bool(logo_image) and os.path.exists(logo_image)
+
+    # encoder="cuda": decode on the GPU and keep scaling, the blurred background
+    # and its composite in VRAM; only the finished frame is downloaded for the
+    # text layers before NVENC. Every scale_cuda outputs 8-bit nv12 so 10-bit
+    # (p010) sources can be overlaid and downloaded as nv12.
+    cuda = encoder == "cuda"
+    video_input_args = (
+        ["-hwaccel", "cuda", "-hwaccel_output_format", "cuda"] if cuda else []
+    )
+
+    num_parts = len(range(start, int(end), part_duration))
+    if not workers:
+        workers = default_workers(num_parts, threads, encoder)
+    if single_encode is None:
+        # With one worker, separate per-part processes add no parallelism, only a
+        # fresh FFmpeg start-up and encoder initialisation for every part
+        single_encode = workers == 1 and num_parts > 1
+    if pix_fmt:
+        video_args += ["-pix_fmt", pix_fmt]
+
+    # (FFmpeg args, output path) per part, rendered in parallel below
+    jobs: List[Tuple[List[str], str]] = []
+
     try:
-        for i, t in enumerate(range(start, int(end), part_duration), initial_part):
-            subclip_end = min(t + part_duration, end)
-            subclip = clip.subclip(t, subclip_end)
+        # --- Static layers ---
+        # Everything except the part label is identical across parts, so the
+        # extra inputs and most of the filter graph are prepared once here.
+        static_inputs: List[str] = []
+        static_filters: List[str] = []
 
+        if abs(aspect_ratio / (9 / 16) - 1) < 0.01:
+            # --- Already 9:16 ---
+            # The video fills the whole frame, so there is no background to build
+            # or composite; only scale (a <1% aspect difference is stretched away).
+            if cuda:
+                static_filters.append(
+                    f"[0:v]scale_cuda={VIDEO_WIDTH}:{VIDEO_HEIGHT}:format=nv12,"
+                    f"hwdownload,format=nv12,setsar=1[base]"
+                )
+            else:
+                static_filters.append(
+                    f"[0:v]scale={VIDEO_WIDTH}:{VIDEO_HEIGHT}:flags=bilinear,"
+                    f"setsar=1[base]"
+                )
+        else:
             # --- Background ---
-            if background_image and os.path.exists(background_image):
-                bg = ImageClip(background_image).set_duration(subclip.duration)
-                bg = resize(bg, height=VIDEO_HEIGHT, width=VIDEO_WIDTH)
+            if has_background:
+                # Pre-scaled once so FFmpeg does not rescale the looped image per frame
+                background_path = os.path.join(temp_dir, "background.png")
+                with Image.open(background_image) as bg:
+                    bg.convert("RGB").resize(
+                        (VIDEO_WIDTH, VIDEO_HEIGHT), Image.LANCZOS
+                    ).save(background_path)
+                # Looped image ends with the video through overlay's shortest=1
+                static_inputs += ["-loop", "1", "-framerate", str(fps)]
+                static_inputs += ["-i", background_path]
+                bg_label = "[1:v]"
+                video_source = "[0:v]"
+            elif cuda:
+                # No blur filter in CUDA; a 1/10 downscale and back up blurs instead
+                static_filters.append("[0:v]split=2[src][blur]")
+                static_filters.append(
+                    f"[blur]scale_cuda={VIDEO_WIDTH // 10}:{VIDEO_HEIGHT // 10},"
+                    f"scale_cuda={VIDEO_WIDTH}:{VIDEO_HEIGHT}:format=nv12[bg]"
+                )
+                bg_label = "[bg]"
+                video_source = "[src]"
             else:
-                bg = (
-                    subclip.resize(height=VIDEO_HEIGHT, width=VIDEO_WIDTH)
-                    .resize(0.3)
-                    .resize(1 / 0.3)
-                ).set_duration(subclip.duration)
+                static_filters.append("[0:v]split=2[src][blur]")
+                # Blur at quarter resolution: boxblur radius 5 there matches ~20 at
+                # full size for 1/16 of the pixel work, then scale back up. The
+                # result is blurred anyway, so the cheapest scaler is good enough.
+                static_filters.append(
+                    f"[blur]scale={VIDEO_WIDTH // 4}:{VIDEO_HEIGHT // 4}"
+                    f":flags=fast_bilinear,boxblur=5:2,"
+                    f"scale={VIDEO_WIDTH}:{VIDEO_HEIGHT}:flags=fast_bilinear[bg]"
+                )
+                bg_label = "[bg]"
+                video_source = "[src]"
 
             # --- Scale video ---
-            aspect_ratio = subclip.w / subclip.h
-            if aspect_ratio > (9 / 16):
-                scaled_video = subclip.resize(width=VIDEO_WIDTH)
+            if cuda:
+                # Explicit even size: NV12 needs it and overlay_cuda takes fixed x/y
+                if aspect_ratio > (9 / 16):
+                    fg_w, fg_h = VIDEO_WIDTH, round(VIDEO_WIDTH / aspect_ratio / 2) * 2
+                else:
+                    fg_w, fg_h = round(VIDEO_HEIGHT * aspect_ratio / 2) * 2, VIDEO_HEIGHT
+                # The background image lives in system memory, so composite there
+                download = ",hwdownload,format=nv12" if has_background else ""
+                static_filters.append(
+                    f"{video_source}scale_cuda={fg_w}:{fg_h}:format=nv12{download}[fg]"
+                )
+            # Bilinear (as MoviePy's resize used) is cheaper than the bicubic default
+            elif aspect_ratio > (9 / 16):
+                static_filters.append(
+                    f"{video_source}scale={VIDEO_WIDTH}:-2:flags=bilinear[fg]"
+                )
             else:
-                scaled_video = subclip.resize(height=VIDEO_HEIGHT)
-            scaled_video = scaled_video.set_position(("center", "center"))
-
-            # --- Logo overlay ---
-            logo_clip = None
-            logo_x, logo_y = 50, VIDEO_HEIGHT - 80
-            if logo_image and os.path.exists(logo_image):
-                logo_clip = ImageClip(logo_image).set_duration(subclip.duration)
-                logo_clip = logo_clip.resize(height=50)
-                logo_clip = logo_clip.set_position((logo_x, logo_y))
-
-            # --- Username overlay ---
-            if logo_clip:
-                username_text = TextClip(
-                    f"/{username[1:]}",
-                    fontsize=30,
-                    font=username_font,
-                    color=username_color,
-                ).set_duration(subclip.duration)
-                username_x = logo_x + logo_clip.w + 10
-                username_y = logo_y + (logo_clip.h - username_text.h) / 2
-                username_text = username_text.set_position((username_x, username_y))
+                static_filters.append(
+                    f"{video_source}scale=-2:{VIDEO_HEIGHT}:flags=bilinear[fg]"
+                )
+
+            # --- Composite video over background ---
+            if cuda and not has_background:
+                static_filters.append(
+                    f"{bg_label}[fg]overlay_cuda="
+                    f"x={(VIDEO_WIDTH - fg_w) // 2}:y={(VIDEO_HEIGHT - fg_h) // 2},"
+                    f"hwdownload,format=nv12[base]"
+                )
             else:
-                username_text = TextClip(
-                    username,
-                    fontsize=30,
-                    font=username_font,
-                    color=username_color,
-                ).set_duration(subclip.duration)
-                username_text = username_text.set_position(
-                    (
-                        VIDEO_WIDTH - username_text.w - 50,
-                        VIDEO_HEIGHT - username_text.h - 50,
-                    )
+                static_filters.append(
+                    f"{bg_label}[fg]overlay=(W-w)/2:(H-h)/2:shortest=1[base]"
                 )
 
-            # --- Title and part overlays ---
-            title_text = (
-                TextClip(video_title, fontsize=70, font=title_font, color=title_color)
-                .set_duration(subclip.duration)
-                .set_position(("center", 200))
-            )
-            part_text = (
-                TextClip(f"Part {i}", fontsize=60, font=part_font, color=part_color)
-                .set_duration(subclip.duration)
-                .set_position(("center", VIDEO_HEIGHT - 250))
+        # --- Logo, username and title overlays (pre-rendered, cropped layers) ---
+        layers = render_static_overlays(
+            temp_dir,
+            logo_image=logo_image if has_logo else None,
+            username=username,
+            video_title=video_title,
+            username_font=username_font,
+            title_font=title_font,
+            username_color=username_color,
+            title_color=title_color,
+        )
+        base = "[base]"
+        for n, (layer_path, layer_x, layer_y) in enumerate(layers):
+            layer_index = static_inputs.count("-i") + 1
+            static_inputs += ["-i", layer_path]
+            static_filters.append(
+                f"{base}[{layer_index}:v]overlay={layer_x}:{layer_y}[layer{n}]"
             )
+            base = f"[layer{n}]"
+        static_graph = ";".join(static_filters)
 
-            # --- Compose all clips ---
-            clips_to_compose = [bg, scaled_video]
-            if logo_clip:
-                clips_to_compose.append(logo_clip)
-            clips_to_compose.extend([title_text, part_text, username_text])
-
-            final = CompositeVideoClip(
-                clips_to_compose, size=(VIDEO_WIDTH, VIDEO_HEIGHT)
-            ).set_audio(subclip.audio)
-
-            # --- Export ---
-            temp_audiofile = os.path.join(temp_dir, f"temp_audio_part{i}.m4a")
-            output_path = os.path.join(output_folder, f"part_{i}.mp4")
-            final.write_videofile(
-                output_path,
-                codec="libx264",
-                audio_codec="aac",
-                fps=30,
-                threads=4,
-                preset="ultrafast",
-                temp_audiofile=temp_audiofile,
-                remove_temp=True,
-                logger="bar",
+        if single_encode:
+            # --- One encode for all parts, split by the segment muxer ---
+            # Same boundaries as the per-part path (relative to start): a tail past
+            # the last multiple of part_duration stays in the last part.
+            cut_points = [
+                t - start for t in range(start + part_duration, int(end), part_duration)
+            ]
+            # Keyframes are forced (as IDR) on every boundary so each part starts on
+            # one, and the label is computed from the frame time, capped at the last
+            # part. The 10 ms offset keeps it from disagreeing with the forced
+            # keyframe on a boundary frame by rounding.
+            part_label = (
+                f"Part %{{eif:min(trunc((t+0.01)/{part_duration}),{num_parts - 1})"
+                f"+{initial_part}:d}}"
+            )
+            part_text = drawtext_filter(
+                part_label,
+                part_font,
+                60,
+                part_color,
+                x="(w-tw)/2",
+                y=str(VIDEO_HEIGHT - 250),
+                expansion="normal",
+            )
+            # fps before drawtext so labels and forced keyframes see output timestamps
+            filter_graph = f"{static_graph};{base}fps={fps},{part_text}[out]"
+            pattern = os.path.join(output_folder.replace("%", "%%"), "part_%d.mp4")
+            run_ffmpeg(
+                video_input_args
+                + ["-ss", str(start), "-t", str(end - start), "-i", input_video]
+                + static_inputs
+                + ["-filter_complex", filter_graph]
+                + ["-map", "[out]", "-map", "0:a:0?"]
+                + video_args
+                + ["-r", str(fps), "-threads", str(threads)]
+                + (
+                    ["-force_key_frames", ",".join(map(str, cut_points))]
+                    + forced_idr_args(encoder)
+                    if cut_points
+                    else []
+                )
+                + audio_args
+                + ["-f", "segment"]
+                + (
+                    ["-segment_times", ",".join(map(str, cut_points))]
+                    if cut_points
+                    else ["-segment_time", str(end)]
+                )
+                + ["-segment_time_delta", f"{0.5 / fps:.4f}"]
+                + (
+                    ["-segment_format_options", f"movflags={movflags}"]
+                    if movflags
+                    else []
+                )
+                + ["-segment_start_number", str(initial_part)]
+                + ["-reset_timestamps", "1", pattern]
             )
+            for i in range(initial_part, initial_part + num_parts):
+                output_path = os.path.join(output_folder, f"part_{i}.mp4")
+                if os.path.exists(output_path):
+                    print(f"Saved {output_path}")
+        else:
+            for i, t in enumerate(range(start, int(end), part_duration), initial_part):
+                subclip_end = min(t + part_duration, end)
+                subclip_duration = subclip_end - t
+                output_path = os.path.join(output_folder, f"part_{i}.mp4")
 
-            print(f"Saved {output_path}")
+                # --- Part overlay (the only per-part layer) ---
+                part_text = drawtext_filter(
+                    f"Part {i}",
+                    part_font,
+                    60,
+                    part_color,
+                    x="(w-tw)/2",
+                    y=str(VIDEO_HEIGHT - 250),
+                )
+                filter_graph = f"{static_graph};{base}{part_text}[out]"
+
+                # --- Export ---
+                # -ss/-t before -i: demuxer-level seek, only the part range is decoded
+                encode_args = (
+                    video_input_args
+                    + ["-ss", str(t), "-t", str(subclip_duration), "-i", input_video]
+                    + static_inputs
+                    + ["-filter_complex", filter_graph]
+                    + ["-map", "[out]", "-map", "0:a:0?"]
+                    + video_args
+                    + ["-r", str(fps), "-threads", str(threads)]
+                    + audio_args
+                    + (["-movflags", movflags] if movflags else [])
+                    + [output_path]
+                )
+                jobs.append((encode_args, output_path))
+
+            # --- Render parts concurrently (each part is an independent FFmpeg process) ---
+            progress = workers == 1
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                futures = [
+                    executor.submit(render_part, args, output_path, progress)
+                    for args, output_path in jobs
+                ]
+                try:
+                    for future in as_completed(futures):
+                        print(f"Saved {future.result()}")
+                except BaseException:
+                    # Ctrl+C or a failed part: don't start the queued parts while
+                    # the executor waits for the running ones on exit
+                    for future in futures:
+                        future.cancel()
+                    raise
 
     finally:
         if os.path.exists(temp_dir):
@@ -307,12 +925,66 @@ def build_parser() -> argparse.ArgumentParser:
         help="End time in seconds to stop splitting (CLI overrides config). Use nothing for video end.",
     )
 
+    parser.add_argument(
+        "--no-overlays",
+        dest="overlays",
+        action="store_false",
+        default=None,
+        help="Only cut the video into parts with stream copy, without overlays (CLI overrides config)",
+    )
+
     parser.add_argument(
         "--initial-part",
         type=int,
         help="End time in seconds to stop splitting (CLI overrides config). Use nothing for video end.",
     )
 
+    parser.add_argument(
+        "--preset",
+        type=str,
+        help="x264 encoder preset, e.g. ultrafast, faster, medium (CLI overrides config)",
+    )
+    parser.add_argument(
+        "--crf",
+        type=int,
+        help="x264 constant rate factor, lower is higher quality (CLI overrides config)",
+    )
+
+    parser.add_argument(
+        "--encoder",
+        type=str,
+        help="Video encoder: auto (hardware if available), libx264, h264_nvenc, h264_qsv, "
+        "h264_amf, h264_videotoolbox, or cuda for decode/scale/encode on an NVIDIA GPU "
+        "(cuda needs an input codec NVDEC can decode) (CLI overrides config)",
+    )
+
+    parser.add_argument(
+        "--workers",
+        type=int,
+        help="Number of parts to encode in parallel; default is based on CPU count (CLI overrides config)",
+    )
+    parser.add_argument(
+        "--threads",
+        type=int,
+        help="Encoder threads per part, or for the single-encode run (CLI overrides config)",
+    )
+
+    parser.add_argument(
+        "--single-encode",
+        dest="single_encode",
+        action="store_true",
+        default=None,
+        help="Encode the whole range once and split it into parts with the segment muxer, "
+        "instead of one encode per part. Default: automatic (CLI overrides config)",
+    )
+    parser.add_argument(
+        "--no-single-encode",
+        dest="single_encode",
+        action="store_false",
+        default=None,
+        help="Always encode each part in its own FFmpeg process (CLI overrides config)",
+    )
+
     return parser
 
 
@@ -335,7 +1007,15 @@ def merge_config_and_cli(
             merged[key] = default_value
 
     # Coerce type-sensible fields to ints if not None
-    for int_key in ("part_duration", "start", "end", "initial_part"):
+    for int_key in (
+        "part_duration",
+        "start",
+        "end",
+        "initial_part",
+        "crf",
+        "workers",
+        "threads",
+    ):
         if merged.get(int_key) is not None:
             try:
                 merged[int_key] = int(merged[int_key])
@@ -379,6 +1059,16 @@ def main():
         part_color=final_args["part_color"],
         output_base=final_args["output_base"],
         initial_part=final_args["initial_part"],
+        overlays=final_args["overlays"],
+        preset=final_args["preset"],
+        crf=final_args["crf"],
+        encoder=final_args["encoder"],
+        workers=final_args["workers"],
+        threads=final_args["threads"],
+        single_encode=final_args["single_encode"],
+        movflags=final_args["movflags"],
+        tune=final_args["tune"],
+        pix_fmt=final_args["pix_fmt"],
     )
 
 